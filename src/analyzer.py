@@ -1,11 +1,16 @@
 # File: src/analyzer.py
+import os
+import sys
+from collections import Counter
 from pathlib import Path
-from collections import defaultdict, Counter
 from tree_sitter_languages import get_parser
 from pathspec import PathSpec
 from pathspec.patterns import GitWildMatchPattern
 from tree_sitter import Language, Parser
 
+from .dedup import NearDuplicateIndex, content_hash, minhash
+from .file_reader import FileReader, DEFAULT_MAX_FILE_BYTES
+
 # Supported file extensions
 EXT_LANGUAGE_MAP = {
     ".py": "python",
@@ -22,25 +27,48 @@ EXT_LANGUAGE_MAP = {
     ".lua": "lua",
 }
 
+# File names that usually mark where a program starts
+ENTRY_POINT_NAMES = {
+    "main.py", "__main__.py", "app.py", "cli.py", "manage.py", "wsgi.py",
+    "index.js", "main.js", "app.js", "server.js", "index.ts", "main.ts",
+    "Main.java", "main.c", "main.cpp", "Program.cs", "main.go", "main.rs",
+    "main.rb", "index.php", "main.lua",
+}
+
+# Sentinel context_map keys that aren't file paths (a root-level `__init__.py` is)
+META_KEYS = {"__structure__", "__summary__", "__dedup__"}
+
 # Language support
 LANG_NODE_TYPES = {
     "python": {
         "functions": ["function_definition"],
-        "classes": ["class_definition"]
+        "classes": ["class_definition"],
+        "imports": ["import_statement", "import_from_statement"]
     },
     "javascript": {
         "functions": ["function"],
-        "classes": ["class"]
+        "classes": ["class"],
+        "imports": ["import_statement"]
     },
     # extend as needed...
 }
 
+
+def iter_nodes(node):
+    """Yields every node below (and including) `node` in document order."""
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        yield current
+        stack.extend(reversed(current.children))
+
 class FileAnalyzer:
     """Analyzes a single file using tree-sitter to extract function/class names."""
 
-    def __init__(self, file_path):
+    def __init__(self, file_path, reader=None):
         self.file_path = Path(file_path)
         self.lang = EXT_LANGUAGE_MAP.get(self.file_path.suffix, None)
+        self.reader = reader or FileReader()
 
     def analyze(self):
         result = {"language": self.lang, "functions": [], "classes": []}
@@ -48,53 +76,148 @@ class FileAnalyzer:
             return result
 
         try:
-            parser = get_parser(self.lang)
-            tree = parser.parse(bytes(self.file_path.read_text(), "utf8"))
-            root = tree.root_node
-
-            lang_nodes = LANG_NODE_TYPES.get(self.lang, {})
-            func_types = lang_nodes.get("functions", [])
-            class_types = lang_nodes.get("classes", [])
-
-            for node in root.walk():
-                try:
-                    if node.type in func_types:
-                        result["functions"].append(node.text.decode(errors="ignore"))
-                    elif node.type in class_types:
-                        result["classes"].append(node.text.decode(errors="ignore"))
-                except:
-                    continue
+            with self.reader.open_bytes(self.file_path) as source:
+                return self.analyze_source(source)
+        except Exception as e:
+            result["error"] = str(e)
+
+        return result
 
+    def analyze_source(self, source):
+        """Analyzes already-read `source` (bytes or mmap); None means the reader skipped it."""
+        result = {"language": self.lang, "functions": [], "classes": []}
+        if source is None:
+            result["skipped"] = True
+            return result
+
+        try:
+            self._collect(source, result)
         except Exception as e:
             result["error"] = str(e)
 
         return result
 
+    def _collect(self, source, result):
+        """Parses `source` (bytes or mmap) and slices node text straight out of it."""
+        parser = get_parser(self.lang)
+        tree = parser.parse(source)
+
+        lang_nodes = LANG_NODE_TYPES.get(self.lang, {})
+        func_types = lang_nodes.get("functions", [])
+        class_types = lang_nodes.get("classes", [])
+
+        for node in iter_nodes(tree.root_node):
+            if node.type in func_types:
+                result["functions"].append(source[node.start_byte:node.end_byte].decode(errors="ignore"))
+            elif node.type in class_types:
+                result["classes"].append(source[node.start_byte:node.end_byte].decode(errors="ignore"))
+
+
+
+class _FolderNode:
+    __slots__ = ("children", "counts")
+
+    def __init__(self):
+        self.children = {}
+        # counts[0] is the file count, counts[i] the file count for language id i
+        self.counts = [0]
 
 
 class StructureAnalyzer:
-    """Tracks semantic folder structure and language mix."""
+    """Tracks semantic folder structure and language mix.
+
+    Folders live in a trie keyed by interned path segments, so adding a file
+    costs one dict lookup and one counter bump per ancestor.
+    """
 
     def __init__(self):
-        self.structure = defaultdict(lambda: Counter())
+        self.root = _FolderNode()
+        self.languages = [None]  # language id -> name; id 0 means "no language"
+        self._lang_ids = {}
+        self.entry_points = []
 
     def add_file(self, file_path, lang):
         parts = Path(file_path).parts
-        for i in range(1, len(parts)):
-            folder = Path(*parts[:i])
-            self.structure[str(folder)]["files"] += 1
-            if lang:
-                self.structure[str(folder)][lang] += 1
+        lang_id = self._lang_id(lang)
+        node = self.root
+        self._bump(node, lang_id)
+        for part in parts[:-1]:
+            child = node.children.get(part)
+            if child is None:
+                child = node.children[sys.intern(part)] = _FolderNode()
+            node = child
+            self._bump(node, lang_id)
+        if parts and parts[-1] in ENTRY_POINT_NAMES:
+            self.entry_points.append(os.path.join(*parts))
+
+    def summarize(self, hot_folders=5):
+        """Computes structure, dominant language, hot folders and entry points in one pass."""
+        structure = {}
+        hot = []
+        for path, node in self._folders():
+            structure[path] = self._node_counts(node)
+            # Rank on files directly in the folder, or every ancestor of a hot
+            # folder would crowd the list with the same files
+            direct = node.counts[0] - sum(child.counts[0] for child in node.children.values())
+            if direct:
+                hot.append((-direct, path))
+
+        totals = self._node_counts(self.root)
+        totals.pop("files")
+        # Ties broken by name so the result doesn't depend on scan order
+        ranked = sorted(totals.items(), key=lambda item: (-item[1], item[0]))
+
+        return {
+            "structure": structure,
+            "language": ranked[0][0] if ranked else "unknown",
+            "languages": dict(ranked),
+            "hot_folders": [path for _, path in sorted(hot)[:hot_folders]],
+            "entry_points": sorted(set(self.entry_points), key=lambda p: (len(Path(p).parts), p)),
+        }
 
-    def get_structure(self):
-        return {k: dict(v) for k, v in self.structure.items()}
+    def _lang_id(self, lang):
+        if not lang:
+            return 0
+        lang_id = self._lang_ids.get(lang)
+        if lang_id is None:
+            lang_id = self._lang_ids[lang] = len(self.languages)
+            self.languages.append(lang)
+        return lang_id
+
+    def _bump(self, node, lang_id):
+        counts = node.counts
+        counts[0] += 1
+        if lang_id:
+            if lang_id >= len(counts):
+                counts.extend([0] * (lang_id + 1 - len(counts)))
+            counts[lang_id] += 1
+
+    def _folders(self):
+        """Yields (path, node) for every folder below the root, depth-first in sorted order."""
+        stack = [(part, child) for part, child in sorted(self.root.children.items(), reverse=True)]
+        while stack:
+            path, node = stack.pop()
+            yield path, node
+            for part, child in sorted(node.children.items(), reverse=True):
+                stack.append((os.path.join(path, part), child))
+
+    def _node_counts(self, node):
+        counts = {"files": node.counts[0]}
+        for lang_id, count in enumerate(node.counts[1:], start=1):
+            if count:
+                counts[self.languages[lang_id]] = count
+        return counts
 
 
 
 class ProjectAnalyzer:
-    def __init__(self, root_path="."):
+    def __init__(self, root_path=".", max_file_bytes=DEFAULT_MAX_FILE_BYTES):
         self.root = Path(root_path)
         self.context_map = {}
+        self.reader = FileReader(max_file_bytes)
+        self.blobs = {}
+        self.near_duplicates = NearDuplicateIndex()
+        self.dedup_stats = Counter()
         self.structure_analyzer = StructureAnalyzer()
         self.ignore_spec = self._load_gitignore()
 
@@ -115,20 +238,82 @@ class ProjectAnalyzer:
                 ".git/",
                 "node_modules/",
             ]
+        # Never worth walking, whatever the project's .gitignore says
+        patterns += [".git/", ".lec/"]
         return PathSpec.from_lines(GitWildMatchPattern, patterns)
 
     def scan(self):
-        for file in self.root.rglob("*"):
-            rel_file = file.relative_to(self.root)
+        for file, rel_file in self._walk_files():
+            if file.suffix in EXT_LANGUAGE_MAP:
+                result = self._analyze_deduplicated(file)
+                self.context_map[str(file)] = result
+                self.structure_analyzer.add_file(rel_file, result.get("language"))
 
-            if self.ignore_spec.match_file(str(rel_file)):
+        summary = self.structure_analyzer.summarize()
+        self.context_map["__structure__"] = summary.pop("structure")
+        self.context_map["__summary__"] = summary
+        self.context_map["__dedup__"] = self.get_dedup_stats()
+        return self.context_map
+
+    def _walk_files(self):
+        """Yields (path, root-relative path) for every non-ignored file, in sorted order.
+
+        Ignored directories are pruned before descending, so `.git`, `venv` and
+        `node_modules` are never listed.
+        """
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            rel_dir = Path(dirpath).relative_to(self.root)
+            dirnames[:] = sorted(d for d in dirnames
+                                 if not self.ignore_spec.match_file((rel_dir / d).as_posix() + "/"))
+            for name in sorted(filenames):
+                rel_file = rel_dir / name
+                if not self.ignore_spec.match_file(rel_file.as_posix()):
+                    yield self.root / rel_file, rel_file
+
+    def _analyze_deduplicated(self, file):
+        """Parses each unique blob once; identical copies share the first path's result."""
+        analyzer = FileAnalyzer(file, self.reader)
+        try:
+            with self.reader.open_bytes(file) as source:
+                if source is None:
+                    return analyzer.analyze_source(None)
+
+                self.dedup_stats["files"] += 1
+                blob = (analyzer.lang, content_hash(source))
+                original = self.blobs.get(blob)
+                if original is not None:
+                    self.dedup_stats["duplicates"] += 1
+                    self.dedup_stats["bytes_saved"] += len(source)
+                    return dict(self.context_map[original], duplicate_of=original)
+                self.blobs[blob] = str(file)
+
+                result = analyzer.analyze_source(source)
+                signature = minhash(source)
+                if signature is not None:
+                    representative = self.near_duplicates.find_or_add(str(file), signature)
+                    if representative is not None:
+                        result["near_duplicate_of"] = representative
+                        self.dedup_stats["near_duplicates"] += 1
+                return result
+        except Exception as e:
+            return {"language": analyzer.lang, "functions": [], "classes": [], "error": str(e)}
+
+    def get_duplicate_groups(self):
+        """Maps each duplicate or near-duplicate file (root-relative) to its representative."""
+        groups = {}
+        for path, result in self.context_map.items():
+            if path in META_KEYS:
                 continue
+            representative = result.get("near_duplicate_of") or result.get("duplicate_of")
+            if representative:
+                groups[self._relative(path)] = self._relative(representative)
+        return groups
 
-            if file.suffix in EXT_LANGUAGE_MAP:
-                analyzer = FileAnalyzer(file)
-                result = analyzer.analyze()
-                self.context_map[str(file)] = result
-                self.structure_analyzer.add_file(file, result.get("language"))
+    def _relative(self, path):
+        return Path(path).relative_to(self.root).as_posix()
 
-        self.context_map["__structure__"] = self.structure_analyzer.get_structure()
-        return self.context_map
\ No newline at end of file
+    def get_dedup_stats(self):
+        stats = {key: self.dedup_stats[key] for key in ("files", "duplicates", "near_duplicates", "bytes_saved")}
+        stats["unique_blobs"] = len(self.blobs)
+        stats["dedup_ratio"] = round(stats["duplicates"] / stats["files"], 3) if stats["files"] else 0.0
+        return stats
\ No newline at end of file
@@ -6,15 +6,19 @@ from rich.syntax import Syntax
 from rich.panel import Panel
 from .model import LocalModel
 from .context import FilesystemContext
-from .analyzer import ProjectAnalyzer, EXT_LANGUAGE_MAP
+from .analyzer import ProjectAnalyzer, EXT_LANGUAGE_MAP, META_KEYS
+from .dedup import save_duplicate_groups
+from .file_reader import DEFAULT_MAX_FILE_BYTES
 from .project_metadata import ProjectMetadata
 from pathlib import Path
 from .smart_context import SmartContextBuilder
+from .scope_context import ScopeContextBuilder, parse_cursor_target
 from .session_manager import SessionManager
 from rich.table import Table
 from .learn import LearnTracker
 from .project_metadata import ProjectMetadata
 from .lsp_diagnostics import LSPDiagnostics
+from .summarizer import HierarchicalSummarizer
 
 console = Console()
 
@@ -30,12 +34,23 @@ def init():
     console.print(Panel("✅ Project initialized!", title="Success", style="green"))
     console.print(f"📁 Cache directory: {context.cache_dir}")
 
+def format_read_stats(stats):
+    return (f"{stats['read']} read, {stats['skipped_too_large']} too large, "
+            f"{stats['skipped_binary']} binary, {stats['skipped_unreadable']} unreadable")
+
+def format_dedup_stats(stats):
+    return (f"{stats['duplicates']} duplicate and {stats['near_duplicates']} near-duplicate files "
+            f"of {stats['files']} (ratio {stats['dedup_ratio']:.1%}), {stats['bytes_saved'] / 1024:.1f} KB not re-parsed")
+
 @cli.command()
 @click.argument("path")
-def select(path):
+@click.option("--max-file-size", default=DEFAULT_MAX_FILE_BYTES, show_default=True,
+              help="Skip files larger than this many bytes (0 = no limit)")
+def select(path, max_file_size):
     console.print(f"🔍 Analyzing project at: {path}", style="blue")
-    analyzer = ProjectAnalyzer(path)
+    analyzer = ProjectAnalyzer(path, max_file_size)
     context_map = analyzer.scan()
+    save_duplicate_groups(path, analyzer.get_duplicate_groups())
     metadata_obj = ProjectMetadata(path)
     metadata = metadata_obj.generate_from_context(context_map)
 
@@ -46,7 +61,9 @@ def select(path):
 
     summary = f"""
                 📁 Project: {Path(path).name}
-                🧠 Files analyzed: {len(context_map)}
+                🧠 Files analyzed: {len(context_map.keys() - META_KEYS)}
+                📄 Files: {format_read_stats(analyzer.reader.stats)}
+                🧬 Dedup: {format_dedup_stats(analyzer.get_dedup_stats())}
                 💾 Session stored: {session_path}
                 🔁 Session ID: {session_path.name}
                 """
@@ -54,24 +71,32 @@ def select(path):
 
 @cli.command()
 @click.argument('path', default='.')
-def init_metadata(path):
-    analyzer = ProjectAnalyzer(path)
+@click.option("--max-file-size", default=DEFAULT_MAX_FILE_BYTES, show_default=True,
+              help="Skip files larger than this many bytes (0 = no limit)")
+def init_metadata(path, max_file_size):
+    analyzer = ProjectAnalyzer(path, max_file_size)
     context_map = analyzer.scan()
+    save_duplicate_groups(path, analyzer.get_duplicate_groups())
     metadata_obj = ProjectMetadata(path)
     meta = metadata_obj.generate_from_context(context_map)
     console.print(Panel("📄 PROJECT_METADATA.lec generated", title="Project Metadata", style="cyan"))
+    console.print(f"📄 Files: {format_read_stats(analyzer.reader.stats)}", style="dim")
+    console.print(f"🧬 Dedup: {format_dedup_stats(analyzer.get_dedup_stats())}", style="dim")
     console.print(meta)
 
 @cli.command()
-@click.argument('file')
-def complete(file):
+@click.argument('target')
+def complete(target):
+    """Complete code in FILE, or at a cursor given as FILE:LINE[:COL]"""
     try:
-        console.print("🤖 Loading model...", style="blue")
-        model = LocalModel()
         context_builder = FilesystemContext()
 
         console.print("📁 Building context...", style="yellow")
-        context = context_builder.get_context(file)
+        file, line, col = parse_cursor_target(target)
+        if line is None:
+            context = context_builder.get_context(file)
+        else:
+            context = ScopeContextBuilder(file).build(line, col)
         key = context_builder._generate_hash_key(context)
         cached = context_builder.load_cached_result(key)
 
@@ -79,6 +104,8 @@ def complete(file):
             console.print("♻️ Using cached result", style="cyan")
             result = cached
         else:
+            console.print("🤖 Loading model...", style="blue")
+            model = LocalModel()
             console.print("🧠 Generating completion...", style="magenta")
             result = model.complete_code(context)
             context_builder.cache_result(key, result)
@@ -89,11 +116,18 @@ def complete(file):
         console.print(f"❌ Error: {str(e)}", style="red")
 
 @cli.command()
-@click.argument('code')
-def explain(code):
+@click.argument('code', required=False)
+@click.option('--file', 'file_path', type=click.Path(exists=True, dir_okay=False), help="Explain a whole source file")
+@click.option('--dir', 'dir_path', type=click.Path(exists=True, file_okay=False), help="Explain every module under a directory")
+def explain(code, file_path, dir_path):
+    """Explain CODE, a file (--file) or a directory of modules (--dir)"""
+    if file_path or dir_path:
+        explain_tree(file_path, dir_path)
+        return
+    if not code:
+        console.print("❌ Pass CODE, --file or --dir", style="red")
+        return
     try:
-        console.print("🤖 Loading model...", style="blue")
-        model = LocalModel()
         context_builder = FilesystemContext()
         key = context_builder._generate_hash_key(code)
         cached = context_builder.load_cached_result(key)
@@ -102,6 +136,8 @@ def explain(code):
             console.print("♻️ Using cached result", style="cyan")
             result = cached
         else:
+            console.print("🤖 Loading model...", style="blue")
+            model = LocalModel()
             console.print("📖 Generating explanation...", style="magenta")
             result = model.explain_code(code)
             context_builder.cache_result(key, result)
@@ -111,6 +147,28 @@ def explain(code):
     except Exception as e:
         console.print(f"❌ Error: {str(e)}", style="red")
 
+def explain_tree(file_path, dir_path):
+    try:
+        summarizer = HierarchicalSummarizer(LocalModel, FilesystemContext())
+        console.print("📖 Summarizing (cached summaries are reused)...", style="magenta")
+        if file_path:
+            result = summarizer.summarize_file(file_path)
+            if result is None:
+                console.print(f"⚠️ Skipped {file_path} (binary, unreadable or too large)", style="yellow")
+                return
+            console.print(Panel(result, title=f"Explanation: {file_path}", style="cyan"))
+        else:
+            modules, files = summarizer.summarize_dir(dir_path)
+            for module, summary in modules.items():
+                console.print(Panel(summary, title=f"Module: {module}", style="cyan"))
+            for path, summary in files.items():
+                console.print(f"📄 [bold]{path}[/]: {summary}")
+        stats = summarizer.stats
+        console.print(f"♻️ {stats['cached']} cached, {stats['generated']} generated", style="dim")
+
+    except Exception as e:
+        console.print(f"❌ Error: {str(e)}", style="red")
+
 @cli.command()
 @click.argument('file')
 def context(file):
@@ -5,11 +5,15 @@ import json
 from datetime import datetime
 import hashlib
 
+from .dedup import DuplicateGroups
+from .file_reader import FileReader
+
 class FilesystemContext:
     def __init__(self, project_root="."):
         self.project_root = Path(project_root)
         self.cache_dir = self.project_root / ".lec" / "cache"
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.reader = FileReader()
 
     def _generate_hash_key(self, content: str) -> str:
         return hashlib.sha256(content.encode()).hexdigest()
@@ -28,20 +32,24 @@ class FilesystemContext:
 
     def get_context(self, current_file, max_chars=1000):
         context_parts = []
+        duplicates = DuplicateGroups(self.project_root)
 
         if os.path.exists(current_file):
-            with open(current_file, 'r') as f:
-                context_parts.append(f"# Current file: {current_file}\n" + f.read())
+            content = self.reader.read_head(current_file, max_chars)
+            if content is not None:
+                duplicates.is_duplicate(current_file)
+                context_parts.append(f"# Current file: {current_file}\n" + content)
 
         current_dir = Path(current_file).parent
         for py_file in current_dir.glob("*.py"):
+            if sum(len(x) + 2 for x in context_parts) >= max_chars:
+                break
             if py_file.name != Path(current_file).name:
-                try:
-                    with open(py_file, 'r') as f:
-                        content = f.read()[:500]
-                        context_parts.append(f"# {py_file.name}\n{content}")
-                except:
-                    pass
+                if duplicates.is_duplicate(py_file):
+                    continue
+                content = self.reader.read_head(py_file, 500)
+                if content is not None:
+                    context_parts.append(f"# {py_file.name}\n{content}")
 
         return "\n\n".join(context_parts)[:max_chars]
 
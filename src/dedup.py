@@ -0,0 +1,103 @@
+# File: src/dedup.py
+import hashlib
+import json
+import re
+import zlib
+from pathlib import Path
+
+SHINGLE_SIZE = 5
+MIN_SHINGLES = 64  # below this, near-duplicate estimates are mostly noise
+MINHASH_MAX_BYTES = 64 * 1024  # near-duplicates share their head; bound the per-file cost
+NUM_BINS = 32
+BANDS = 8
+NEAR_DUPLICATE_THRESHOLD = 0.85
+DUPLICATES_FILE = "duplicates.json"
+
+TOKEN_PATTERN = re.compile(rb"\w+|[^\w\s]")
+_EMPTY_BIN = 1 << 32
+
+
+def content_hash(data):
+    """Hex digest of raw file contents (bytes, mmap or any buffer)."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def minhash(data):
+    """One-permutation MinHash of the token shingles in the first MINHASH_MAX_BYTES
+    of `data`, or None if there are too few shingles.
+
+    Each shingle is hashed once; the hash picks a bin and the rest of it competes
+    for that bin's minimum, so the cost is linear in the (capped) input.
+    """
+    tokens = TOKEN_PATTERN.findall(data[:MINHASH_MAX_BYTES])
+    if len(tokens) < SHINGLE_SIZE + MIN_SHINGLES - 1:
+        return None
+    shingles = {zlib.crc32(b" ".join(tokens[i:i + SHINGLE_SIZE]))
+                for i in range(len(tokens) - SHINGLE_SIZE + 1)}
+    signature = [_EMPTY_BIN] * NUM_BINS
+    for shingle in shingles:
+        slot, value = shingle % NUM_BINS, shingle // NUM_BINS
+        if value < signature[slot]:
+            signature[slot] = value
+    return tuple(signature)
+
+
+def similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity of two MinHash signatures."""
+    return sum(a == b for a, b in zip(sig_a, sig_b)) / len(sig_a)
+
+
+class NearDuplicateIndex:
+    """LSH index over MinHash signatures; maps each near-duplicate to the first file seen."""
+
+    def __init__(self, threshold=NEAR_DUPLICATE_THRESHOLD):
+        self.threshold = threshold
+        self.rows = NUM_BINS // BANDS
+        self.buckets = {}
+        self.signatures = {}
+
+    def find_or_add(self, key, signature):
+        """Returns the representative `key` is a near-duplicate of, else indexes it and returns None."""
+        bands = [(i, signature[i * self.rows:(i + 1) * self.rows]) for i in range(BANDS)]
+        candidates = {c for band in bands for c in self.buckets.get(band, [])}
+
+        scored = [(similarity(signature, self.signatures[c]), c) for c in candidates]
+        scored = [item for item in scored if item[0] >= self.threshold]
+        if scored:
+            return min(scored, key=lambda item: (-item[0], item[1]))[1]
+
+        self.signatures[key] = signature
+        for band in bands:
+            self.buckets.setdefault(band, []).append(key)
+        return None
+
+
+def save_duplicate_groups(root, groups):
+    """Writes {path: representative} (root-relative) from a scan for the context builders."""
+    groups_file = Path(root) / ".lec" / DUPLICATES_FILE
+    groups_file.parent.mkdir(parents=True, exist_ok=True)
+    groups_file.write_text(json.dumps(groups, indent=2, sort_keys=True))
+
+
+class DuplicateGroups:
+    """Lets context builders keep one representative per group of duplicate files,
+    using the groups found by the last `lec select` / `lec init-metadata` scan."""
+
+    def __init__(self, root="."):
+        self.root = Path(root).resolve()
+        groups_file = self.root / ".lec" / DUPLICATES_FILE
+        self.groups = json.loads(groups_file.read_text()) if groups_file.exists() else {}
+        self.included = set()
+
+    def is_duplicate(self, path):
+        """True if a file from `path`'s group was already taken; otherwise records the group."""
+        resolved = Path(path).resolve()
+        try:
+            rel = resolved.relative_to(self.root).as_posix()
+        except ValueError:
+            rel = resolved.as_posix()
+        group = self.groups.get(rel, rel)
+        if group in self.included:
+            return True
+        self.included.add(group)
+        return False
@@ -0,0 +1,106 @@
+# File: src/file_reader.py
+import codecs
+import mmap
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+
+DEFAULT_MAX_FILE_BYTES = 1024 * 1024
+SNIFF_BYTES = 8192
+
+BOMS = [
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+]
+
+
+class FileReader:
+    """Shared, size-capped reader: memory-maps source files, sniffs binary
+    content and encoding from the leading bytes, and counts what it skipped."""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_FILE_BYTES):
+        self.max_bytes = max_bytes
+        self.stats = Counter()
+
+    @contextmanager
+    def open_bytes(self, path):
+        """Yields a read-only UTF-8 buffer (an mmap where possible) or None if skipped.
+
+        The buffer is only valid inside the `with` block.
+        """
+        path = Path(path)
+        try:
+            size = path.stat().st_size
+        except OSError:
+            self.stats["skipped_unreadable"] += 1
+            yield None
+            return
+
+        if self.max_bytes and size > self.max_bytes:
+            self.stats["skipped_too_large"] += 1
+            yield None
+            return
+
+        if size == 0:
+            self.stats["read"] += 1
+            yield b""
+            return
+
+        try:
+            f = open(path, "rb")
+        except OSError:
+            self.stats["skipped_unreadable"] += 1
+            yield None
+            return
+
+        with f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            head = buf[:SNIFF_BYTES]
+            if self._is_binary(head):
+                self.stats["skipped_binary"] += 1
+                yield None
+                return
+
+            encoding = self._detect_encoding(head)
+            self.stats["read"] += 1
+            self.stats["bytes_read"] += size
+            if encoding in ("utf-8", "utf-8-sig"):
+                yield buf
+            else:
+                # tree-sitter wants UTF-8; transcoding is the one copy we can't avoid.
+                self.stats["transcoded"] += 1
+                yield buf[:].decode(encoding, errors="replace").encode("utf8")
+
+    def read_head(self, path, max_chars):
+        """Returns roughly the first `max_chars` characters of `path`, or None if skipped."""
+        path = Path(path)
+        try:
+            with open(path, "rb") as f:
+                head = f.read(max(max_chars * 4, SNIFF_BYTES))
+        except OSError:
+            self.stats["skipped_unreadable"] += 1
+            return None
+
+        if self._is_binary(head[:SNIFF_BYTES]):
+            self.stats["skipped_binary"] += 1
+            return None
+
+        self.stats["heads_read"] += 1
+        decoder = codecs.getincrementaldecoder(self._detect_encoding(head))(errors="replace")
+        return decoder.decode(head, final=False)[:max_chars]
+
+    def _is_binary(self, head):
+        if head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+            return False
+        return b"\0" in head
+
+    def _detect_encoding(self, head):
+        for bom, encoding in BOMS:
+            if head.startswith(bom):
+                return encoding
+        try:
+            # A truncated multi-byte sequence at the cut is fine; only real errors count.
+            codecs.getincrementaldecoder("utf-8")().decode(head, final=False)
+            return "utf-8"
+        except UnicodeDecodeError:
+            return "latin-1"
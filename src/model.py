@@ -1,23 +1,57 @@
 # File: src/model.py
-from llama_cpp import Llama
-import os
+MODEL_PATH = "models/Phi-3-mini-4k-instruct-q4.gguf"
+N_CTX = 2048
+# Instruction text, BOS and the "COMPLETION:"-style suffix around the payload
+PROMPT_OVERHEAD_TOKENS = 64
+
+SUMMARY_PROMPTS = {
+    "symbol": "Summarize what this code does in one sentence:",
+    "file": "Summarize what this source file does in two sentences:",
+    "file_parts": "These are summaries of the parts of one source file. Summarize the whole file in two sentences:",
+    "module": "These are summaries of the files in one module. Summarize the module in two sentences:",
+}
+
+
+def completion_prompt(context):
+    return f"Complete this Python code:\n\n{context}\n\nCOMPLETION:"
+
+
+def explanation_prompt(code):
+    return f"Explain this Python code briefly:\n\n{code}\n\nEXPLANATION:"
+
 
 class LocalModel:
     def __init__(self):
-        model_path = "models/Phi-3-mini-4k-instruct-q4.gguf"
+        # Imported here so cache hits never load the llama.cpp library
+        from llama_cpp import Llama
         self.llm = Llama(
-            model_path=model_path,
-            n_ctx=2048,
+            model_path=MODEL_PATH,
+            n_ctx=N_CTX,
             n_threads=4,
             verbose=False
         )
 
     def complete_code(self, context):
-        prompt = f"Complete this Python code:\n\n{context}\n\nCOMPLETION:"
-        response = self.llm(prompt, max_tokens=80, stop=["\n\n", "```"])
+        # Keep the end of the context: that's where the cursor is
+        context = self._fit(context, 80, keep_tail=True)
+        response = self.llm(completion_prompt(context), max_tokens=80, stop=["\n\n", "```"])
         return response['choices'][0]['text'].strip()
 
     def explain_code(self, code):
-        prompt = f"Explain this Python code briefly:\n\n{code}\n\nEXPLANATION:"
+        response = self.llm(explanation_prompt(self._fit(code, 100)), max_tokens=100)
+        return response['choices'][0]['text'].strip()
+
+    def summarize(self, text, kind="symbol"):
+        prompt = f"{SUMMARY_PROMPTS[kind]}\n\n{self._fit(text, 100)}\n\nSUMMARY:"
         response = self.llm(prompt, max_tokens=100)
         return response['choices'][0]['text'].strip()
+
+    def _fit(self, text, max_tokens, keep_tail=False):
+        """Trims `text` with the model's tokenizer so the prompt plus `max_tokens` fits in N_CTX."""
+        budget = N_CTX - max_tokens - PROMPT_OVERHEAD_TOKENS
+        tokens = self.llm.tokenize(text.encode("utf-8"), add_bos=False)
+        if len(tokens) <= budget:
+            return text
+        tokens = tokens[-budget:] if keep_tail else tokens[:budget]
+        return self.llm.detokenize(tokens).decode("utf-8", errors="ignore")
+
@@ -2,6 +2,8 @@
 import yaml
 from pathlib import Path
 
+from .analyzer import META_KEYS
+
 METADATA_FILE = "PROJECT_METADATA.lec"
 
 class ProjectMetadata:
@@ -24,14 +26,15 @@ class ProjectMetadata:
             yaml.dump(data, f, default_flow_style=False)
 
     def generate_from_context(self, context_map):
-        languages = list(set(v.get("language", "") for v in context_map.values() if isinstance(v, dict)))
+        summary = context_map.get("__summary__", {})
         structure = context_map.get("__structure__", {})
         # generated_summary = self._summarize_context_map(context_map)
 
         generated = {
             "project_name": self.root.name,
-            "language": languages[0] if languages else "unknown",
-            "entry_points": [],
+            "language": summary.get("language", "unknown"),
+            "entry_points": summary.get("entry_points", []),
+            "hot_folders": summary.get("hot_folders", []),
             "test_paths": ["tests/"],
             "ignore_paths": ["venv", ".venv", "__pycache__", ".git", "node_modules"],
             "description": "",
@@ -44,7 +47,7 @@ class ProjectMetadata:
     def _summarize_context_map(self, context_map):
         summary = {"functions": 0, "classes": 0, "modules": 0, "score": 0}
         for file, data in context_map.items():
-            if file == "__structure__":
+            if file in META_KEYS:
                 continue
             summary["modules"] += 1
             summary["functions"] += len(data.get("functions", []))
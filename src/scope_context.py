@@ -0,0 +1,281 @@
+# File: src/scope_context.py
+import re
+from pathlib import Path
+from tree_sitter_languages import get_parser
+
+from .analyzer import EXT_LANGUAGE_MAP, LANG_NODE_TYPES, iter_nodes
+from .file_reader import FileReader
+
+CURSOR_PATTERN = re.compile(r"^(.+?):(\d+)(?::(\d+))?$")
+IDENTIFIER_TYPES = {"identifier", "type_identifier", "property_identifier"}
+PARAMETER_TYPES = {"parameters", "lambda_parameters", "formal_parameters"}
+# Node type -> field holding the names it binds
+BINDING_FIELDS = {
+    "assignment": "left",
+    "augmented_assignment": "left",
+    "for_statement": "left",
+    "for_in_statement": "left",
+    "variable_declarator": "name",
+}
+
+
+def parse_cursor_target(target):
+    """Splits `file[:line[:col]]` into (file, line, col); line/col are 1-based or None."""
+    if Path(target).exists():
+        return target, None, None
+    match = CURSOR_PATTERN.match(target)
+    if not match:
+        return target, None, None
+    file, line, col = match.groups()
+    return file, int(line), int(col) if col else None
+
+
+class ScopeContextBuilder:
+    """Builds a cursor-local prompt: enclosing scope, imports in scope and
+    signatures of the symbols referenced there."""
+
+    def __init__(self, file_path):
+        self.file_path = Path(file_path)
+        self.lang = EXT_LANGUAGE_MAP.get(self.file_path.suffix, None)
+        self.node_types = LANG_NODE_TYPES.get(self.lang, {})
+        self.reader = FileReader()
+
+    def build(self, line, col=None, max_chars=1000):
+        with self.reader.open_bytes(self.file_path) as source:
+            if source is None:
+                raise ValueError(f"Skipped {self.file_path}: binary, unreadable or larger than the size cap")
+            return self._build(source, line, col, max_chars)
+
+    def _build(self, source, line, col, max_chars):
+        cursor = self._cursor_offset(source, line, col)
+        header = f"# Current file: {self.file_path}\n"
+
+        if not self.node_types:
+            return header + self._trim_head(self._window(source, cursor), max_chars - len(header))
+
+        tree = get_parser(self.lang).parse(source)
+        chain = self._scope_chain(tree.root_node, cursor)
+        if not self._innermost(chain, self._definition_types()):
+            # tree-sitter ends a block at its last statement, so an indented blank
+            # line right after it belongs to no node; treat it as still in the block
+            trailing = self._trailing_definition(tree.root_node, source, cursor)
+            if trailing is not None:
+                chain = self._ancestors(trailing)
+        func = self._innermost(chain, self.node_types.get("functions", []))
+        cls = self._innermost(chain, self.node_types.get("classes", []))
+
+        scope_node = func or cls
+        if scope_node is not None:
+            scope = self._text(source, self._line_start(source, scope_node.start_byte), cursor)
+            if func is not None and cls is not None and cls.start_byte < func.start_byte:
+                scope = self._header(source, cls) + "\n" + scope
+            names = self._referenced_names(scope_node, source, cursor)
+        else:
+            scope = self._window(source, cursor)
+            names = set()
+
+        budget = max_chars - len(header)
+        scope = self._trim_head(scope, budget)
+        budget -= len(scope)
+
+        sections = []
+        imports = [self._text(source, n.start_byte, n.end_byte) for n in tree.root_node.children
+                   if n.type in self.node_types.get("imports", [])]
+        # The window fallback may already show the module's imports
+        imports = [text for text in imports if text not in scope]
+        imports = self._take(imports, budget)
+        if imports:
+            sections.append("\n".join(imports))
+            budget -= len(sections[-1]) + 2
+
+        signatures = self._take(self._signatures(names, tree.root_node, source), budget)
+        if signatures:
+            sections.append("# Referenced signatures\n" + "\n".join(signatures))
+
+        sections.append(scope)
+        return header + "\n\n".join(sections)
+
+    def _cursor_offset(self, source, line, col):
+        offset = 0
+        for _ in range(max(line - 1, 0)):
+            newline = source.find(b"\n", offset)
+            if newline == -1:
+                break
+            offset = newline + 1
+        end = source.find(b"\n", offset)
+        text = source[offset:end if end != -1 else len(source)].rstrip(b"\r")
+        column = len(text) if col is None else min(max(col - 1, 0), len(text))
+        return offset + column
+
+    def _scope_chain(self, root, cursor):
+        chain = []
+        node = root
+        while node is not None:
+            chain.append(node)
+            node = next((c for c in node.children if c.start_byte <= cursor <= c.end_byte), None)
+        return chain
+
+    def _trailing_definition(self, root, source, cursor):
+        """Innermost definition that ends before the cursor with only whitespace in
+        between, when the cursor's line is indented deeper than the definition."""
+        line_start = self._line_start(source, cursor)
+        prefix = self._text(source, line_start, cursor)
+        indent = len(prefix) - len(prefix.lstrip())
+
+        candidates = [node for node in iter_nodes(root)
+                      if node.type in self._definition_types() and node.end_byte <= line_start
+                      and not self._text(source, node.end_byte, line_start).strip()]
+        # Deepest first: a method and its class can end on the same byte
+        for node in sorted(candidates, key=lambda n: len(self._ancestors(n)), reverse=True):
+            def_start = self._line_start(source, node.start_byte)
+            if node.start_byte - def_start < indent:
+                return node
+        return None
+
+    def _ancestors(self, node):
+        chain = []
+        while node is not None:
+            chain.append(node)
+            node = node.parent
+        return list(reversed(chain))
+
+    def _definition_types(self):
+        return self.node_types.get("functions", []) + self.node_types.get("classes", [])
+
+    def _innermost(self, chain, types):
+        for node in reversed(chain):
+            if node.type in types:
+                return node
+        return None
+
+    def _referenced_names(self, scope_node, source, cursor):
+        """Identifiers used before the cursor, minus parameters and locally assigned names."""
+        own_name = scope_node.child_by_field_name("name")
+        names = set()
+        bound = set()
+        for node in iter_nodes(scope_node):
+            if node.start_byte >= cursor:
+                continue
+            if node.type in IDENTIFIER_TYPES and not self._same(node, own_name):
+                names.add(self._text(source, node.start_byte, node.end_byte))
+            elif node.type in PARAMETER_TYPES:
+                bound.update(self._parameter_names(node, source))
+            elif node.type in BINDING_FIELDS:
+                target = node.child_by_field_name(BINDING_FIELDS[node.type])
+                if target is not None:
+                    bound.update(self._bound_names(target, source))
+        return names - bound
+
+    def _parameter_names(self, parameters, source):
+        names = []
+        for param in parameters.named_children:
+            name = param if param.type == "identifier" else param.child_by_field_name("name")
+            if name is None:
+                # typed_parameter, *args, **kwargs: the name is the first identifier child
+                name = next((c for c in param.named_children if c.type == "identifier"), None)
+            if name is not None:
+                names.append(self._text(source, name.start_byte, name.end_byte))
+        return names
+
+    def _bound_names(self, target, source):
+        """Plain names bound by an assignment target (`x`, `a, b`), not attributes or subscripts."""
+        if target.type == "identifier":
+            return [self._text(source, target.start_byte, target.end_byte)]
+        if target.type in ("pattern_list", "tuple_pattern", "list_pattern", "array_pattern"):
+            return [name for child in target.named_children for name in self._bound_names(child, source)]
+        return []
+
+    def _imported_names(self, root, source):
+        """Maps each name the module imports to the name its defining file uses
+        (they differ for `import x as y`); only these can come from a sibling."""
+        names = {}
+        for node in root.children:
+            if node.type not in self.node_types.get("imports", []):
+                continue
+            module = node.child_by_field_name("module_name") or node.child_by_field_name("source")
+            for child in iter_nodes(node):
+                if module is not None and module.start_byte <= child.start_byte < module.end_byte:
+                    continue
+                if child.type == "aliased_import":
+                    original, alias = child.child_by_field_name("name"), child.child_by_field_name("alias")
+                    if original is not None and alias is not None:
+                        original_name = self._text(source, original.start_byte, original.end_byte)
+                        names[self._text(source, alias.start_byte, alias.end_byte)] = original_name.split(".")[-1]
+                elif child.type in IDENTIFIER_TYPES:
+                    name = self._text(source, child.start_byte, child.end_byte)
+                    names.setdefault(name, name)
+        return names
+
+    def _signatures(self, names, root, source):
+        if not names:
+            return []
+        signatures = self._definitions(names, root, source)
+        imported_names = self._imported_names(root, source)
+        imported = {imported_names[name] for name in names if name in imported_names}
+        if not imported:
+            return list(dict.fromkeys(signatures))
+        for sibling in sorted(self.file_path.parent.glob(f"*{self.file_path.suffix}")):
+            if sibling.name == self.file_path.name:
+                continue
+            with self.reader.open_bytes(sibling) as sibling_source:
+                if sibling_source is None:
+                    continue
+                if not any(sibling_source.find(name.encode()) != -1 for name in imported):
+                    continue
+                sibling_root = get_parser(self.lang).parse(sibling_source).root_node
+                signatures.extend(self._definitions(imported, sibling_root, sibling_source))
+        return list(dict.fromkeys(signatures))
+
+    def _definitions(self, names, root, source):
+        def_types = self._definition_types()
+        found = []
+        for node in iter_nodes(root):
+            if node.type not in def_types:
+                continue
+            name = node.child_by_field_name("name")
+            if name is not None and self._text(source, name.start_byte, name.end_byte) in names:
+                found.append(self._header(source, node).strip() + " ...")
+        return found
+
+    def _header(self, source, node):
+        """Returns the definition line(s) of `node` up to (not including) its body."""
+        body = node.child_by_field_name("body")
+        end = body.start_byte if body is not None else node.end_byte
+        return self._text(source, self._line_start(source, node.start_byte), end).rstrip()
+
+    def _window(self, source, cursor, max_lines=40):
+        start = cursor
+        for _ in range(max_lines):
+            start = source.rfind(b"\n", 0, start)
+            if start <= 0:
+                start = 0
+                break
+        return self._text(source, start, cursor).lstrip("\n")
+
+    def _same(self, node, other):
+        return other is not None and (node.start_byte, node.end_byte) == (other.start_byte, other.end_byte)
+
+    def _line_start(self, source, offset):
+        return source.rfind(b"\n", 0, offset) + 1
+
+    def _text(self, source, start, end):
+        return source[start:end].decode("utf8", errors="ignore")
+
+    def _trim_head(self, text, max_chars):
+        """Keeps the tail of `text` (the code nearest the cursor), cut on a line boundary."""
+        if len(text) <= max_chars:
+            return text
+        if max_chars <= 0:
+            return ""
+        tail = text[-max_chars:]
+        newline = tail.find("\n")
+        return tail[newline + 1:] if newline != -1 else tail
+
+    def _take(self, parts, budget):
+        taken = []
+        for part in parts:
+            if budget - len(part) - 1 < 0:
+                break
+            taken.append(part)
+            budget -= len(part) + 1
+        return taken
@@ -2,7 +2,10 @@ import json
 from pathlib import Path
 
 from src.analyzer import EXT_LANGUAGE_MAP
+from .dedup import DuplicateGroups
+from .file_reader import FileReader
 from .project_metadata import ProjectMetadata
+from .summarizer import load_module_summaries
 
 class SmartContextBuilder:
     def __init__(self, root="."):
@@ -10,6 +13,8 @@ class SmartContextBuilder:
         self.metadata = ProjectMetadata(root).load()
         self.context_map = self._load_context_map()
         self.ignore = set(self.metadata.get("ignore_paths", []))
+        self.reader = FileReader()
+        self.module_summaries = load_module_summaries(root)
 
     def _load_context_map(self):
         context_file = self.root / ".lec" / "context_map.json"
@@ -23,28 +28,42 @@ class SmartContextBuilder:
     def _build_trimmed_context(self, filepath, max_chars):
         buffer = []
         seen = set()
+        duplicates = DuplicateGroups(self.root)
         files = self._rank_files_by_relevance(filepath)
 
+        module_summary = self._module_summary(filepath)
+        if module_summary:
+            buffer.append(module_summary)
+
         for f in files:
             if f in seen:
                 continue
             if any(p in Path(f).parts for p in self.ignore):
                 continue
-            try:
-                with open(f, "r", encoding="utf-8") as src:
-                    code = src.read()
-                    if len(code) > 800:
-                        code = code[:800] + "\n# ...trimmed...\n"
-                    buffer.append(f"# File: {f}\n{code}")
-                    seen.add(f)
-            except:
+            if duplicates.is_duplicate(f):
+                continue
+            code = self.reader.read_head(f, 801)
+            if code is None:
                 continue
+            if len(code) > 800:
+                code = code[:800] + "\n# ...trimmed...\n"
+            buffer.append(f"# File: {f}\n{code}")
+            seen.add(f)
             if sum(len(x) for x in buffer) > max_chars:
                 break
 
         return "\n\n".join(buffer)
 
 
+    def _module_summary(self, filepath):
+        """Cached `lec explain --dir` summary of the file's module, if there is one."""
+        try:
+            module = Path(filepath).resolve().parent.relative_to(self.root.resolve()).as_posix() or "."
+        except ValueError:
+            return None
+        summary = self.module_summaries.get(module)
+        return f"# Module {module}: {summary}" if summary else None
+
     def _rank_files_by_relevance(self, filepath):
         ranked = [str(Path(filepath).resolve())]
 
@@ -0,0 +1,210 @@
+# File: src/summarizer.py
+import hashlib
+import json
+from collections import Counter
+from pathlib import Path
+from tree_sitter_languages import get_parser
+
+from .analyzer import EXT_LANGUAGE_MAP, LANG_NODE_TYPES
+from .file_reader import FileReader
+from .project_metadata import ProjectMetadata
+
+# The model has a 2048-token window; keep room for the instruction and the answer.
+PROMPT_TOKEN_BUDGET = 1500
+CHARS_PER_TOKEN = 3
+SUMMARIES_FILE = "summaries.json"
+DEFAULT_IGNORE = ["venv", ".venv", "__pycache__", ".git", "node_modules", ".lec"]
+
+
+class HierarchicalSummarizer:
+    """Map-reduce summaries (symbol -> file -> module) that fit the model's window.
+
+    Every summary is cached under a hash of the text it was generated from,
+    so after an edit only the changed symbols and their parents are regenerated.
+    """
+
+    def __init__(self, model_factory, cache, root=".", reader=None):
+        self.model_factory = model_factory
+        self.model = None
+        self.cache = cache
+        self.root = Path(root)
+        self.reader = reader or FileReader()
+        self.max_chars = PROMPT_TOKEN_BUDGET * CHARS_PER_TOKEN
+        self.ignore = set(ProjectMetadata(root).load().get("ignore_paths", DEFAULT_IGNORE)) | {".lec"}
+        self.stats = Counter()
+
+    def summarize_file(self, path):
+        """Returns the summary of one source file, or None if it can't be read."""
+        path = Path(path)
+        with self.reader.open_bytes(path) as source:
+            if source is None:
+                return None
+            key = self._key("file", source)
+            cached = self.cache.load_cached_result(key)
+            if cached is not None:
+                self.stats["cached"] += 1
+                return cached
+
+            if len(source) <= self.max_chars:
+                summary = self._generate("file", self._decode(source))
+            else:
+                parts = [f"{name}: {self._summarize_code(code)}" for name, code in self._symbols(path, source)]
+                summary = self._reduce("file_parts", parts)
+
+        self.cache.cache_result(key, summary)
+        return summary
+
+    def summarize_dir(self, path):
+        """Summarizes every module below `path`; returns {module: summary} and saves it."""
+        path = Path(path)
+        modules = {}
+        files = {}
+        self._summarize_module(path, modules, files)
+        self._save(modules)
+        return modules, files
+
+    def _summarize_module(self, path, modules, files):
+        parts = []
+        child_summaries = []
+        for entry in sorted(path.iterdir()):
+            if entry.name in self.ignore:
+                continue
+            if entry.is_dir():
+                summary = self._summarize_module(entry, modules, files)
+                if summary:
+                    parts.append(f"{entry.name}/: {summary}")
+                    child_summaries.append(summary)
+            elif entry.suffix in EXT_LANGUAGE_MAP:
+                summary = self.summarize_file(entry)
+                if summary:
+                    files[str(entry)] = summary
+                    parts.append(f"{entry.name}: {summary}")
+                    child_summaries.append(summary)
+
+        if not parts:
+            return None
+        # A module with a single child says nothing its child doesn't
+        summary = child_summaries[0] if len(parts) == 1 else self._reduce("module", parts)
+        modules[self._module_name(path)] = summary
+        return summary
+
+    def _symbols(self, path, source):
+        """Splits a file into (name, code) chunks: one per top-level definition, plus the rest."""
+        lang = EXT_LANGUAGE_MAP.get(path.suffix)
+        lang_nodes = LANG_NODE_TYPES.get(lang, {})
+        if not lang_nodes:
+            return self._chunks(path.name, self._decode(source))
+
+        def_types = lang_nodes.get("functions", []) + lang_nodes.get("classes", [])
+        symbols = []
+        rest = []
+        for node in get_parser(lang).parse(source).root_node.children:
+            definition = node
+            if node.type == "decorated_definition":
+                definition = node.child_by_field_name("definition") or node
+            code = self._decode(source[node.start_byte:node.end_byte])
+            if definition.type in def_types:
+                name = definition.child_by_field_name("name")
+                label = self._decode(source[name.start_byte:name.end_byte]) if name else definition.type
+                symbols.extend(self._chunks(label, code))
+            else:
+                rest.append(code)
+        if rest:
+            symbols = self._chunks("<module level>", "\n".join(rest)) + symbols
+        return symbols
+
+    def _chunks(self, name, code):
+        """Cuts oversized code into window-sized pieces on line boundaries."""
+        if len(code) <= self.max_chars:
+            return [(name, code)]
+        chunks = []
+        current = ""
+        # Minified code and big literal tables can put more than a window on one line
+        pieces = (line[i:i + self.max_chars]
+                  for line in code.splitlines(keepends=True)
+                  for i in range(0, len(line), self.max_chars))
+        for piece in pieces:
+            if current and len(current) + len(piece) > self.max_chars:
+                chunks.append(current)
+                current = ""
+            current += piece
+        if current:
+            chunks.append(current)
+        return [(f"{name} (part {i})", chunk) for i, chunk in enumerate(chunks, 1)]
+
+    def _summarize_code(self, code):
+        key = self._key("symbol", code.encode("utf8"))
+        cached = self.cache.load_cached_result(key)
+        if cached is not None:
+            self.stats["cached"] += 1
+            return cached
+        summary = self._generate("symbol", code)
+        self.cache.cache_result(key, summary)
+        return summary
+
+    def _reduce(self, kind, parts):
+        """Summarizes child summaries, batching them until they fit in one prompt."""
+        while True:
+            batches = self._batch(parts)
+            summaries = [self._reduce_batch(kind, batch) for batch in batches]
+            if len(summaries) == 1:
+                return summaries[0]
+            parts = summaries
+
+    def _reduce_batch(self, kind, batch):
+        text = "\n".join(batch)
+        key = self._key(kind, text.encode("utf8"))
+        cached = self.cache.load_cached_result(key)
+        if cached is not None:
+            self.stats["cached"] += 1
+            return cached
+        summary = self._generate(kind, text)
+        self.cache.cache_result(key, summary)
+        return summary
+
+    def _batch(self, parts):
+        batches = [[]]
+        size = 0
+        for part in parts:
+            part = part[:self.max_chars]
+            if batches[-1] and size + len(part) + 1 > self.max_chars:
+                batches.append([])
+                size = 0
+            batches[-1].append(part)
+            size += len(part) + 1
+        return batches
+
+    def _generate(self, kind, text):
+        if self.model is None:
+            self.model = self.model_factory()
+        self.stats["generated"] += 1
+        return self.model.summarize(text, kind)
+
+    def _key(self, kind, data):
+        digest = hashlib.sha256(kind.encode())
+        digest.update(b"\0")
+        digest.update(data)
+        return f"summary-{digest.hexdigest()}"
+
+    def _decode(self, data):
+        return bytes(data).decode("utf8", errors="replace")
+
+    def _module_name(self, path):
+        try:
+            return path.resolve().relative_to(self.root.resolve()).as_posix() or "."
+        except ValueError:
+            return path.resolve().as_posix()
+
+    def _save(self, modules):
+        summaries_file = self.root / ".lec" / SUMMARIES_FILE
+        summaries_file.parent.mkdir(parents=True, exist_ok=True)
+        existing = load_module_summaries(self.root)
+        existing.update(modules)
+        summaries_file.write_text(json.dumps(existing, indent=2, sort_keys=True))
+
+
+def load_module_summaries(root="."):
+    summaries_file = Path(root) / ".lec" / SUMMARIES_FILE
+    if summaries_file.exists():
+        return json.loads(summaries_file.read_text())
+    return {}